@@ -0,0 +1,8 @@
+"""
+Django settings for running the test suite.
+"""
+from app.settings import *  # noqa: F401,F403
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
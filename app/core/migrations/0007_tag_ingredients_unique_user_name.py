@@ -0,0 +1,53 @@
+# Generated by Django 3.2.23 on 2026-10-15 09:00
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicates(apps, schema_editor):
+    """Fold objects a user has under the same name into the oldest one,
+    moving their recipe links over"""
+    Recipe = apps.get_model('core', 'Recipe')
+    for model_name, relation in (('Tag', 'tag'), ('Ingredients', 'ingredients')):
+        model = apps.get_model('core', model_name)
+        through = getattr(Recipe, relation).through
+        duplicates = model.objects.values('user', 'name').annotate(
+            count=Count('id'), keep_id=Min('id')).filter(count__gt=1)
+        for duplicate in duplicates:
+            keep_id = duplicate['keep_id']
+            stale_ids = list(model.objects.filter(
+                user=duplicate['user'], name=duplicate['name'],
+            ).exclude(id=keep_id).values_list('id', flat=True))
+            recipe_ids = set(through.objects.filter(
+                **{f'{relation}_id__in': stale_ids}
+            ).values_list('recipe_id', flat=True))
+            recipe_ids -= set(through.objects.filter(
+                **{f'{relation}_id': keep_id}
+            ).values_list('recipe_id', flat=True))
+            through.objects.bulk_create([
+                through(recipe_id=recipe_id, **{f'{relation}_id': keep_id})
+                for recipe_id in recipe_ids
+            ])
+            model.objects.filter(id__in=stale_ids).delete()
+
+
+class Migration(migrations.Migration):
+    # The merge runs in its own transaction: Postgres refuses to add the
+    # constraints in the one that deleted rows other tables reference.
+    atomic = False
+
+    dependencies = [
+        ('core', '0006_recipe_image'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='uniq_tag_per_user'),
+        ),
+        migrations.AddConstraint(
+            model_name='ingredients',
+            constraint=models.UniqueConstraint(fields=('user', 'name'), name='uniq_ingredient_per_user'),
+        ),
+    ]
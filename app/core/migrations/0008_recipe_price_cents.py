@@ -0,0 +1,57 @@
+# Generated by Django 3.2.23 on 2026-10-15 09:30
+
+from django.db import migrations, models
+from django.db.models import ExpressionWrapper, F
+from django.db.models.functions import Cast, Greatest
+
+
+def price_to_cents(apps, schema_editor):
+    Recipe = apps.get_model('core', 'Recipe')
+    # The old DecimalField accepted negative prices; cents are unsigned.
+    # Clamp in the same UPDATE: writing a row twice in this transaction
+    # queues FK trigger events that make the RemoveField below fail.
+    Recipe.objects.update(price_cents=ExpressionWrapper(
+        Greatest(F('price'), 0) * 100,
+        output_field=models.PositiveIntegerField()))
+
+
+def cents_to_price(apps, schema_editor):
+    Recipe = apps.get_model('core', 'Recipe')
+    price = models.DecimalField(max_digits=7, decimal_places=2)
+    Recipe.objects.update(price=ExpressionWrapper(
+        Cast('price_cents', price) / 100, output_field=price))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_tag_ingredients_unique_user_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='price_cents',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='price',
+            field=models.DecimalField(decimal_places=2, max_digits=5, null=True),
+        ),
+        migrations.RunPython(price_to_cents, cents_to_price),
+        migrations.RemoveField(
+            model_name='recipe',
+            name='price',
+        ),
+        migrations.RenameField(
+            model_name='recipe',
+            old_name='price_cents',
+            new_name='price',
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='price',
+            field=models.PositiveIntegerField(help_text='Price in cents'),
+        ),
+    ]
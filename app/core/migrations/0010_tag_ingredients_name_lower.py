@@ -0,0 +1,62 @@
+# Generated by Django 3.2.23 on 2026-10-15 10:30
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+from django.db.models.functions import Lower
+
+
+def fill_name_lower(apps, schema_editor):
+    for model_name in ('Tag', 'Ingredients'):
+        model = apps.get_model('core', model_name)
+        model.objects.update(name_lower=Lower('name'))
+
+
+def merge_case_duplicates(apps, schema_editor):
+    """Fold objects whose names differ only by case into the oldest one,
+    moving their recipe links over"""
+    Recipe = apps.get_model('core', 'Recipe')
+    for model_name, relation in (('Tag', 'tag'), ('Ingredients', 'ingredients')):
+        model = apps.get_model('core', model_name)
+        through = getattr(Recipe, relation).through
+        duplicates = model.objects.values('user', 'name_lower').annotate(
+            count=Count('id'), keep_id=Min('id')).filter(count__gt=1)
+        for duplicate in duplicates:
+            keep_id = duplicate['keep_id']
+            stale_ids = list(model.objects.filter(
+                user=duplicate['user'], name_lower=duplicate['name_lower'],
+            ).exclude(id=keep_id).values_list('id', flat=True))
+            recipe_ids = set(through.objects.filter(
+                **{f'{relation}_id__in': stale_ids}
+            ).values_list('recipe_id', flat=True))
+            recipe_ids -= set(through.objects.filter(
+                **{f'{relation}_id': keep_id}
+            ).values_list('recipe_id', flat=True))
+            through.objects.bulk_create([
+                through(recipe_id=recipe_id, **{f'{relation}_id': keep_id})
+                for recipe_id in recipe_ids
+            ])
+            model.objects.filter(id__in=stale_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_recipe_user_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='name_lower',
+            field=models.CharField(default='', editable=False, max_length=255),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='ingredients',
+            name='name_lower',
+            field=models.CharField(default='', editable=False, max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_name_lower, migrations.RunPython.noop),
+        migrations.RunPython(merge_case_duplicates, migrations.RunPython.noop),
+    ]
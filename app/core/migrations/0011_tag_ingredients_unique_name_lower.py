@@ -0,0 +1,29 @@
+# Generated by Django 3.2.23 on 2026-10-15 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_tag_ingredients_name_lower'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='tag',
+            name='uniq_tag_per_user',
+        ),
+        migrations.RemoveConstraint(
+            model_name='ingredients',
+            name='uniq_ingredient_per_user',
+        ),
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(fields=('user', 'name_lower'), name='uniq_tag_per_user'),
+        ),
+        migrations.AddConstraint(
+            model_name='ingredients',
+            constraint=models.UniqueConstraint(fields=('user', 'name_lower'), name='uniq_ingredient_per_user'),
+        ),
+    ]
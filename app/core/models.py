@@ -1,5 +1,6 @@
-import uuid
 import os
+from decimal import Decimal
+
 from django.db import models
 from django.contrib.auth.models import (
     AbstractBaseUser, BaseUserManager, PermissionsMixin
@@ -8,12 +9,15 @@ from django.contrib.auth.models import (
 from django.conf import settings
 
 
+RECIPE_IMAGE_DIR = os.path.join('uploads', 'recipe', '')
+
+
 def recipe_image_file_path(instance, filename):
     """Generate File path for new image"""
     ext = os.path.splitext(filename)[1]
-    filename = f'{uuid.uuid4()}{ext}'
+    filename = os.urandom(16).hex() + ext
 
-    return os.path.join('uploads', 'recipe', filename)
+    return RECIPE_IMAGE_DIR + filename
 
 
 class UserManager(BaseUserManager):
@@ -27,12 +31,8 @@ class UserManager(BaseUserManager):
         return user
 
     def create_superuser(self, email, password):
-        user = self.create_user(email, password)
-        user.is_staff = True
-        user.is_superuser = True
-        user.save(using=self._db)
-
-        return user
+        return self.create_user(
+            email, password, is_staff=True, is_superuser=True)
 
 class User(AbstractBaseUser, PermissionsMixin):
     email = models.EmailField(unique=True, max_length=254)
@@ -53,33 +53,68 @@ class Recipe(models.Model):
     title=models.CharField(max_length=255)
     description = models.TextField(blank=True)
     time_in_minutes = models.IntegerField()
-    price = models.DecimalField(max_digits=5, decimal_places=2)
+    price = models.PositiveIntegerField(help_text='Price in cents')
     link = models.CharField(max_length=255, blank=True)
     tag = models.ManyToManyField('Tag')
     ingredients = models.ManyToManyField('Ingredients')
     image = models.ImageField(null=True, upload_to=recipe_image_file_path)
 
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            models.Index(
+                fields=['user', '-id'], name='recipe_user_id_desc_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
+    @property
+    def price_display(self):
+        """Price as a Decimal in currency units"""
+        return Decimal(self.price).scaleb(-2)
+
 
 class Tag(models.Model):
     name = models.CharField(max_length=255)
+    name_lower = models.CharField(max_length=255, editable=False)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'name_lower'], name='uniq_tag_per_user'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.name_lower = self.name.lower()
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
 
 
 class Ingredients(models.Model):
     name = models.CharField(max_length=255)
+    name_lower = models.CharField(max_length=255, editable=False)
     user = models.ForeignKey(
             settings.AUTH_USER_MODEL,
             on_delete=models.CASCADE
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'name_lower'],
+                name='uniq_ingredient_per_user'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.name_lower = self.name.lower()
+        super().save(*args, **kwargs)
+
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
@@ -22,8 +22,10 @@ class CustomAdmin(TestCase):
         url = reverse('admin:core_user_changelist')
         res = self.client.get(url)
 
-        self.assertContains(res, self.user.name)
-        self.assertContains(res, self.user.email)
+        self.assertEqual(res.status_code, 200)
+        content = res.content.decode()
+        self.assertIn(self.user.name, content)
+        self.assertIn(self.user.email, content)
 
     def test_user_edit(self):
         url = reverse('admin:core_user_change', args=[self.user.id])
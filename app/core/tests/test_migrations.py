@@ -0,0 +1,95 @@
+"""
+Tests for data migrations
+"""
+from decimal import Decimal
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+BEFORE_UNIQUE_NAMES = [('core', '0006_recipe_image')]
+AFTER_UNIQUE_NAMES = [('core', '0007_tag_ingredients_unique_user_name')]
+BEFORE_CENTS = [('core', '0007_tag_ingredients_unique_user_name')]
+AFTER_CENTS = [('core', '0008_recipe_price_cents')]
+
+
+class MigrationTestCase(TransactionTestCase):
+    """Base class for tests moving the schema between migrations"""
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        if 'core' not in executor.loader.migrated_apps:
+            self.skipTest('migrations are disabled for this run')
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def migrate(self, targets):
+        """Migrate to targets and return the historical apps there"""
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+
+class UniqueNamesMigrationTest(MigrationTestCase):
+    """Test merging duplicate tag and ingredient names"""
+
+    def test_duplicate_tags_merged(self):
+        apps = self.migrate(BEFORE_UNIQUE_NAMES)
+        Tag = apps.get_model('core', 'Tag')
+        Recipe = apps.get_model('core', 'Recipe')
+        user = apps.get_model('core', 'User').objects.create(
+            email='user@example.com')
+        tag1 = Tag.objects.create(user=user, name='Lunch')
+        tag2 = Tag.objects.create(user=user, name='Lunch')
+        r1, r2 = [
+            Recipe.objects.create(
+                user=user, title=title, time_in_minutes=5,
+                price=Decimal('1.00'))
+            for title in ('Soup', 'Salad')
+        ]
+        r1.tag.add(tag1, tag2)
+        r2.tag.add(tag2)
+
+        apps = self.migrate(AFTER_UNIQUE_NAMES)
+        Tag = apps.get_model('core', 'Tag')
+        Recipe = apps.get_model('core', 'Recipe')
+        self.assertEqual(
+            list(Tag.objects.values_list('id', flat=True)), [tag1.id])
+        for recipe in (r1, r2):
+            self.assertEqual(
+                list(Recipe.objects.get(id=recipe.id).tag.values_list(
+                    'id', flat=True)),
+                [tag1.id])
+
+
+class RecipePriceCentsMigrationTest(MigrationTestCase):
+    """Test converting recipe prices to cents and back"""
+
+    def create_recipe(self, apps, price):
+        user = apps.get_model('core', 'User').objects.create(
+            email=f'user{price}@example.com')
+        return apps.get_model('core', 'Recipe').objects.create(
+            user=user, title='Sample recipe', time_in_minutes=5, price=price)
+
+    def test_price_round_trip(self):
+        apps = self.migrate(BEFORE_CENTS)
+        recipe = self.create_recipe(apps, Decimal('12.34'))
+
+        apps = self.migrate(AFTER_CENTS)
+        Recipe = apps.get_model('core', 'Recipe')
+        self.assertEqual(Recipe.objects.get(id=recipe.id).price, 1234)
+
+        apps = self.migrate(BEFORE_CENTS)
+        Recipe = apps.get_model('core', 'Recipe')
+        self.assertEqual(
+            Recipe.objects.get(id=recipe.id).price, Decimal('12.34'))
+
+    def test_negative_price_becomes_zero(self):
+        apps = self.migrate(BEFORE_CENTS)
+        recipe = self.create_recipe(apps, Decimal('-5.00'))
+
+        apps = self.migrate(AFTER_CENTS)
+        Recipe = apps.get_model('core', 'Recipe')
+        self.assertEqual(Recipe.objects.get(id=recipe.id).price, 0)
@@ -1,6 +1,7 @@
 from unittest.mock import patch
 from decimal import Decimal
 
+from django.db import IntegrityError
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
@@ -29,7 +30,7 @@ class ModelTestCase(TestCase):
             ["test2@example.COM", "test2@example.com"],
         ]
         for email, expected in list_of_emails:
-            user = get_user_model().objects.create_user(email, "sample123")
+            user = get_user_model().objects.create_user(email)
             self.assertEqual(user.email, expected)
 
     def test_for_user_without_email_to_raise_error(self):
@@ -52,16 +53,32 @@ class ModelTestCase(TestCase):
             title="Sample recipe",
             description="Sample recipe description",
             time_in_minutes=5,
-            price=Decimal('10.30'),
+            price=1030,
         )
 
         self.assertEqual(str(recipe), recipe.title)
+        self.assertEqual(recipe.price_display, Decimal('10.30'))
 
     def test_create_tags(self):
         user = create_user()
         tag = models.Tag.objects.create(user=user, name='Tag1')
 
         self.assertEqual(str(tag), tag.name)
+        self.assertEqual(tag.name_lower, 'tag1')
+
+    def test_tag_name_unique_per_user(self):
+        user = create_user()
+        models.Tag.objects.create(user=user, name='Tag1')
+
+        with self.assertRaises(IntegrityError):
+            models.Tag.objects.create(user=user, name='Tag1')
+
+    def test_tag_name_unique_per_user_ignoring_case(self):
+        user = create_user()
+        models.Tag.objects.create(user=user, name='Lunch')
+
+        with self.assertRaises(IntegrityError):
+            models.Tag.objects.create(user=user, name='lunch')
 
     def test_create_ingredient(self):
         user = create_user()
@@ -72,11 +89,14 @@ class ModelTestCase(TestCase):
 
         self.assertEqual(str(ingredient), ingredient.name)
 
-    @patch('core.models.uuid.uuid4')
-    def test_recipe_file_name_uuid(self, mock_uuid):
+    @patch('core.models.os.urandom')
+    def test_recipe_file_name_random_hex(self, mock_urandom):
         """Test generating image path"""
-        uuid = 'test uuid'
-        mock_uuid.return_value = uuid
+        mock_urandom.return_value = bytes(range(16))
         file_path = models.recipe_image_file_path(None, 'example.jpg')
 
-        self.assertEqual(file_path, f'uploads/recipe/{uuid}.jpg')
\ No newline at end of file
+        mock_urandom.assert_called_once_with(16)
+        self.assertEqual(
+            file_path,
+            'uploads/recipe/000102030405060708090a0b0c0d0e0f.jpg'
+        )
\ No newline at end of file
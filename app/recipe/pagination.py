@@ -0,0 +1,10 @@
+"""
+Pagination for the recipe APIs
+"""
+from rest_framework.pagination import CursorPagination
+
+
+class RecipeCursorPagination(CursorPagination):
+    """Keyset pagination over recipes, newest first"""
+    ordering = '-id'
+    page_size = 50
@@ -0,0 +1,40 @@
+"""
+Renderers for the recipe APIs
+"""
+import orjson
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON renderer backed by orjson
+
+    Requests for indented, non-compact, ASCII-only or non-strict output
+    (including the browsable API's indent=4) are left to JSONRenderer,
+    as orjson cannot produce them, and so is data orjson fails on, such
+    as integers wider than 64 bits. Datetimes go through DRF's encoder
+    so they keep its format. In strict mode orjson writes NaN and
+    Infinity as null where JSONRenderer would raise.
+    """
+    default = JSONEncoder().default
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if (indent or not self.compact or self.ensure_ascii
+                or not self.strict):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escape the line separators JSON allows but JavaScript does not,
+        # as JSONRenderer does.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+            b'\xe2\x80\xa9', b'\\u2029')
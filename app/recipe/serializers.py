@@ -1,78 +1,189 @@
+import copy
+
 from core.models import (Recipe,
                          Tag,
                          Ingredients)
 
+from django.db import models, transaction
+
 from rest_framework import serializers
 
-class TagSerializer(serializers.ModelSerializer):
+
+class PriceField(serializers.DecimalField):
+    """Decimal price on the API, stored as integer cents"""
+    def to_internal_value(self, data):
+        return int(super().to_internal_value(data).scaleb(2))
+
+    def to_representation(self, value):
+        return f'{value // 100}.{value % 100:02d}'
+
+
+class NameListSerializer(serializers.ListSerializer):
+    """Render lists of tags/ingredients as {id, name} dicts without
+    running the child serializer per item"""
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        return [{'id': obj.id, 'name': obj.name} for obj in iterable]
+
+
+class RecipeAttrSerializer(serializers.ModelSerializer):
+    """Base serializer for recipe attributes owned by a user"""
+    def validate_name(self, value):
+        """Reject a name the user already has for another object"""
+        # Nested under a recipe, existing names are reused, not rejected.
+        if self.root is not self:
+            return value
+        queryset = self.Meta.model.objects.filter(
+            user=self.context['request'].user, name_lower=value.lower())
+        if self.instance is not None:
+            queryset = queryset.exclude(pk=self.instance.pk)
+        if queryset.exists():
+            raise serializers.ValidationError(
+                f'You already have one named "{value}".')
+        return value
+
+
+class TagSerializer(RecipeAttrSerializer):
     """Serializer for tags"""
     class Meta:
         model = Tag
         fields = ['id', 'name']
         read_only_fields = ['id']
+        list_serializer_class = NameListSerializer
 
 
-class IngredientSerializer(serializers.ModelSerializer):
+class IngredientSerializer(RecipeAttrSerializer):
     """Serializer for Ingredient"""
     class Meta:
         model = Ingredients
         fields = ['id', 'name']
         read_only_fields = ['id']
+        list_serializer_class = NameListSerializer
 
 class RecipeSerializer(serializers.ModelSerializer):
-    tags = TagSerializer(many=True, required=False)
+    tags = TagSerializer(many=True, required=False, source='tag')
     ingredients = IngredientSerializer(many=True, required=False)
+    price = PriceField(max_digits=5, decimal_places=2, min_value=0)
     class Meta:
         model = Recipe
         fields = ['id', 'title','time_in_minutes', 'price', 'link', 'tags', 'ingredients']
         read_only_fields = ['id']
 
-    def _get_or_create_tags(self, tags, recipe):
-        """Handling the creation or getting of a new tag"""
-        auth_user = self.context['request'].user
-        for tag in tags:
-            tag_obj, created = Tag.objects.get_or_create(
-                user=auth_user,
-                **tag,
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._auth_user = None
+
+    def get_fields(self):
+        """Introspect the model fields once per serializer class and hand
+        each instance its own copy"""
+        cls = type(self)
+        cached_fields = cls.__dict__.get('_cached_fields')
+        if cached_fields is None:
+            cached_fields = super().get_fields()
+            cls._cached_fields = cached_fields
+        return copy.deepcopy(cached_fields)
+
+    @classmethod
+    def represent_rows(cls, rows):
+        """Render recipe rows from a values() projection the same way as
+        to_representation, with one query per related table"""
+        if not rows:
+            return rows
+        recipe_ids = [row['id'] for row in rows]
+        tags = cls._related_names(Recipe.tag.through, 'tag', recipe_ids)
+        ingredients = cls._related_names(
+            Recipe.ingredients.through, 'ingredients', recipe_ids)
+        price_field = cls._declared_fields['price']
+        for row in rows:
+            row['price'] = price_field.to_representation(row['price'])
+            row['tags'] = tags.get(row['id'], [])
+            row['ingredients'] = ingredients.get(row['id'], [])
+        return rows
+
+    @staticmethod
+    def _related_names(through, field_name, recipe_ids):
+        """Map recipe ids to the {id, name} dicts of a m2m relation"""
+        related = {}
+        rows = through.objects.filter(recipe_id__in=recipe_ids).values_list(
+            'recipe_id', f'{field_name}_id', f'{field_name}__name')
+        for recipe_id, obj_id, name in rows:
+            related.setdefault(recipe_id, []).append(
+                {'id': obj_id, 'name': name})
+        return related
+
+    def _get_auth_user(self):
+        """Return the requesting user, looked up once per serializer"""
+        if self._auth_user is None:
+            self._auth_user = self.context['request'].user
+        return self._auth_user
+
+    def _get_or_create_objects(self, model, items):
+        """Return the user's objects for the given names, creating any
+        missing ones in a single bulk insert"""
+        auth_user = self._get_auth_user()
+        names = {}
+        for item in items:
+            names.setdefault(item['name'].lower(), item['name'])
+        if not names:
+            return []
+        existing = {
+            obj.name_lower: obj for obj in model.objects.filter(
+                user=auth_user, name_lower__in=names
+            ).only('id', 'name_lower')
+        }
+        missing = [key for key in names if key not in existing]
+        if missing:
+            model.objects.bulk_create(
+                [
+                    model(user=auth_user, name=names[key], name_lower=key)
+                    for key in missing
+                ],
+                ignore_conflicts=True,
             )
-            recipe.tag.add(tag_obj)
-
-    def _get_or_create_ingredients(self, ingredients, recipe):
-        """Handling the creation or getting of new ingredients"""
-        auth_user = self.context['request'].user
-        for ingredient in ingredients:
-            ingredient_obj, create = Ingredients.objects.get_or_create(
-                user=auth_user,
-                **ingredient,
+            existing.update(
+                (obj.name_lower, obj) for obj in model.objects.filter(
+                    user=auth_user, name_lower__in=missing
+                ).only('id', 'name_lower')
             )
-            recipe.ingredients.add(ingredient_obj)
+        return [existing[key] for key in names]
+
+    def _get_or_create_tags(self, tags):
+        """Handling the creation or getting of a new tag"""
+        return self._get_or_create_objects(Tag, tags)
 
+    def _get_or_create_ingredients(self, ingredients):
+        """Handling the creation or getting of new ingredients"""
+        return self._get_or_create_objects(Ingredients, ingredients)
 
     def create(self, validated_data):
         """Create a new Recipe"""
-        tags = validated_data.pop('tags', [])
+        tags = validated_data.pop('tag', [])
         ingredients = validated_data.pop('ingredients', [])
-        recipe = Recipe.objects.create(**validated_data)
-        self._get_or_create_tags(tags, recipe)
-        self._get_or_create_ingredients(ingredients, recipe)
+        with transaction.atomic():
+            recipe = Recipe.objects.create(**validated_data)
+            if tags:
+                recipe.tag.add(*self._get_or_create_tags(tags))
+            if ingredients:
+                recipe.ingredients.add(
+                    *self._get_or_create_ingredients(ingredients))
 
         return recipe
 
     def update(self, instance, validated_data):
         """Test to update a recipe"""
-        tags = validated_data.pop('tags', None)
+        tags = validated_data.pop('tag', None)
         ingredients = validated_data.pop('ingredients', None)
-        if tags is not None:
-            instance.tag.clear()
-            self._get_or_create_tags(tags, instance)
+        with transaction.atomic():
+            if tags is not None:
+                instance.tag.set(self._get_or_create_tags(tags))
 
-        if ingredients is not None:
-            instance.ingredients.clear()
-            self._get_or_create_ingredients(ingredients, instance)
+            if ingredients is not None:
+                instance.ingredients.set(
+                    self._get_or_create_ingredients(ingredients))
 
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
         return instance
 
 
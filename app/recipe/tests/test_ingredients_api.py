@@ -1,7 +1,5 @@
 """Tests for the Ingredients API"""
-from decimal import Decimal
-
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
@@ -30,11 +28,21 @@ def create_ingredient(user, **params):
     return ingredient
 
 
+def create_ingredients(user, names):
+    """Create and return new ingredients in one insert"""
+    return Ingredients.objects.bulk_create(
+        [
+            Ingredients(user=user, name=name, name_lower=name.lower())
+            for name in names
+        ]
+    )
+
+
 def create_user(email="user@example.com", password="password123"):
     return get_user_model().objects.create_user(email=email, password=password)
 
 
-class PublicIngredientAPITest(TestCase):
+class PublicIngredientAPITest(SimpleTestCase):
     """Test case for public users."""
 
     def setUp(self):
@@ -50,19 +58,21 @@ class PublicIngredientAPITest(TestCase):
 class PrivateIngredientAPITest(TestCase):
     """Test case for private users."""
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
         self.client = APIClient()
-        self.user = create_user()
-
         self.client.force_authenticate(self.user)
 
     def test_retrieve_ingredients(self):
         """Test to retrieve a list of ingredients"""
-        create_ingredient(user=self.user, name="Ingredient1")
-        create_ingredient(user=self.user, name="Ingredient12")
+        create_ingredients(self.user, ["Ingredient1", "Ingredient12"])
 
-        res = self.client.get(INGREDIENT_URL)
-        ingredients = Ingredients.objects.all().order_by('-name')
+        with self.assertNumQueries(1):
+            res = self.client.get(INGREDIENT_URL)
+        ingredients = list(Ingredients.objects.all().order_by('-name'))
         serializer = IngredientSerializer(ingredients, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -92,6 +102,28 @@ class PrivateIngredientAPITest(TestCase):
         ingredient.refresh_from_db()
         self.assertEqual(ingredient.name, payload["name"])
 
+    def test_update_ingredient_to_existing_name_error(self):
+        """Test renaming an ingredient to another one's name is rejected"""
+        create_ingredient(user=self.user, name='Pepper')
+        ingredient = create_ingredient(user=self.user, name='Salt')
+        url = detail_url(ingredient.id)
+        res = self.client.patch(url, {'name': 'Pepper'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        ingredient.refresh_from_db()
+        self.assertEqual(ingredient.name, 'Salt')
+
+    def test_update_ingredient_to_existing_name_other_case_error(self):
+        """Test renaming to another ingredient's name in other case fails"""
+        create_ingredient(user=self.user, name='Pepper')
+        ingredient = create_ingredient(user=self.user, name='Salt')
+        url = detail_url(ingredient.id)
+        res = self.client.patch(url, {'name': 'PEPPER'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        ingredient.refresh_from_db()
+        self.assertEqual(ingredient.name, 'Salt')
+
     def test_delete_ingredient(self):
         """Test deleting an ingredient"""
         ingredient = create_ingredient(user=self.user)
@@ -104,12 +136,12 @@ class PrivateIngredientAPITest(TestCase):
 
     def test_filtering_ingredients_assigned_to_recipes(self):
         """Test to list filtered ingredients assigned to recipes"""
-        ing1 = create_ingredient(user=self.user, name='Corn')
-        ing2 = create_ingredient(user=self.user, name='Cassava Dough')
+        ing1, ing2 = create_ingredients(
+            self.user, ['Corn', 'Cassava Dough'])
         recipe1 = Recipe.objects.create(
             title='Banku',
             time_in_minutes=40,
-            price=Decimal('10.00'),
+            price=1000,
             user=self.user
         )
         recipe1.ingredients.add(ing1)
@@ -124,18 +156,18 @@ class PrivateIngredientAPITest(TestCase):
 
     def test_filtered_ingredients_are_unique(self):
         """Test for checking uniqueness of filtered ingredients"""
-        ing = create_ingredient(user=self.user, name='Kontomire')
-        create_ingredient(user=self.user, name='Garden Eggs')
+        ing, _ = create_ingredients(
+            self.user, ['Kontomire', 'Garden Eggs'])
         recipe1 = Recipe.objects.create(
             title='Palava Sauce',
             time_in_minutes=40,
-            price=Decimal('30.00'),
+            price=3000,
             user=self.user,
         )
         recipe2 = Recipe.objects.create(
             title='Garden Egg Stew',
             time_in_minutes=45,
-            price=Decimal('30.00'),
+            price=3000,
             user=self.user,
         )
         recipe1.ingredients.add(ing)
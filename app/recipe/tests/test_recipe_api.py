@@ -1,11 +1,14 @@
 from decimal import Decimal
 
-import tempfile
+import io
 import os
+import tempfile
 
 from PIL import Image
 
-from django.test import TestCase
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
@@ -32,25 +35,37 @@ def image_upload_url(recipe_id):
     return reverse('recipe:recipe-upload-image', args=[recipe_id])
 
 
-def create_recipe(user, **params):
-    defaults = {
-        'title': 'Sample Recipe',
-        'description': 'Sample Recipe Description',
-        'time_in_minutes': 60,
-        'price': Decimal('32.34'),
-        'link': 'http://example.com/sample.pdf'
-    }
+RECIPE_DEFAULTS = {
+    'title': 'Sample Recipe',
+    'description': 'Sample Recipe Description',
+    'time_in_minutes': 60,
+    'price': 3234,
+    'link': 'http://example.com/sample.pdf'
+}
+
+
+def create_recipes(user, n=2, titles=None, **params):
+    """Create and return n recipes, or one per title, in a single insert"""
+    defaults = dict(RECIPE_DEFAULTS)
     defaults.update(params)
+    title = defaults.pop('title')
+    if titles is None:
+        titles = [title] * n
 
-    recipe = Recipe.objects.create(user=user, **defaults)
-    return recipe
+    return Recipe.objects.bulk_create(
+        [Recipe(user=user, title=title, **defaults) for title in titles]
+    )
+
+
+def create_recipe(user, **params):
+    return create_recipes(user, 1, **params)[0]
 
 
 def create_user(**params):
     return get_user_model().objects.create_user(**params)
 
 
-class PublicRecipeAPITest(TestCase):
+class PublicRecipeAPITest(SimpleTestCase):
     def setUp(self):
         self.client = APIClient()
 
@@ -61,25 +76,43 @@ class PublicRecipeAPITest(TestCase):
 
 
 class PrivateRecipeAPITest(TestCase):
-    def setUp(self):
-        self.user = create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(
             email='user@example.com',
             password='password',
         )
+
+    def setUp(self):
         self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_recipe(self):
-        create_recipe(user=self.user)
-        create_recipe(user=self.user)
+        r1, r2 = create_recipes(user=self.user)
+
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPE_URL)
+
+        serializer = RecipeSerializer([r2, r1], many=True)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['results'], serializer.data)
+
+    def test_recipe_list_is_paginated(self):
+        """Test the recipe list is served in cursor pages"""
+        create_recipes(self.user, 51)
 
         res = self.client.get(RECIPE_URL)
 
-        recipes = Recipe.objects.all().order_by('-id')
-        serializer = RecipeSerializer(recipes, many=True)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data['results']), 50)
+        self.assertIsNone(res.data['previous'])
+
+        res = self.client.get(res.data['next'])
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(len(res.data['results']), 1)
+        self.assertIsNone(res.data['next'])
 
     def test_recipe_limited_to_user(self):
         other_user = create_user(
@@ -87,14 +120,13 @@ class PrivateRecipeAPITest(TestCase):
             password='otheruser123',
         )
         create_recipe(user=other_user)
-        create_recipe(user=self.user)
+        recipe = create_recipe(user=self.user)
 
         res = self.client.get(RECIPE_URL)
-        recipes = Recipe.objects.filter(user=self.user)
-        serializer = RecipeSerializer(recipes, many=True)
+        serializer = RecipeSerializer([recipe], many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res.data, serializer.data)
+        self.assertEqual(res.data['results'], serializer.data)
 
     def test_detail_recipe(self):
         recipe = create_recipe(user=self.user)
@@ -116,6 +148,8 @@ class PrivateRecipeAPITest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         recipe = Recipe.objects.get(id=res.data['id'])
         for k, v in payload.items():
+            if k == 'price':
+                k = 'price_display'
             self.assertEqual(getattr(recipe, k), v)
         self.assertEqual(recipe.user, self.user)
 
@@ -156,6 +190,8 @@ class PrivateRecipeAPITest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         recipe.refresh_from_db()
         for k, v in payload.items():
+            if k == 'price':
+                k = 'price_display'
             self.assertEqual(getattr(recipe, k), v)
         self.assertEqual(recipe.user, self.user)
 
@@ -205,12 +241,9 @@ class PrivateRecipeAPITest(TestCase):
         self.assertEqual(recipes.count(), 1)
         recipe = recipes[0]
         self.assertEqual(recipe.tag.count(), 2)
-        for tag in payload['tags']:
-            exists = recipe.tag.filter(
-                name=tag['name'],
-                user=self.user
-            ).exists()
-            self.assertTrue(exists)
+        names = set(recipe.tag.filter(
+            user=self.user).values_list('name', flat=True))
+        self.assertEqual(names, {tag['name'] for tag in payload['tags']})
 
     def test_create_recipe_with_existing_tag(self):
         """Test for creating a recipe with an existing tag"""
@@ -229,12 +262,44 @@ class PrivateRecipeAPITest(TestCase):
         recipe = recipes[0]
         self.assertEqual(recipe.tag.count(), 2)
         self.assertIn(tag_gh, recipe.tag.all())
-        for tag in payload['tags']:
-            exists = recipe.tag.filter(
-                name=tag['name'],
-                user=self.user,
-            ).exists()
-            self.assertTrue(exists)
+        names = set(recipe.tag.filter(
+            user=self.user).values_list('name', flat=True))
+        self.assertEqual(names, {tag['name'] for tag in payload['tags']})
+
+    def test_create_recipe_tag_queries_do_not_scale(self):
+        """Test tags are created in bulk rather than one at a time"""
+        def count_create_queries(tag_names):
+            payload = {
+                'title': 'Sample Title',
+                'time_in_minutes': 30,
+                'price': Decimal('30.89'),
+                'tags': [{'name': name} for name in tag_names],
+            }
+            with CaptureQueriesContext(connection) as queries:
+                res = self.client.post(RECIPE_URL, payload, format='json')
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+
+        self.assertEqual(
+            count_create_queries(['Dessert', 'Dinner']),
+            count_create_queries(['Soup', 'Stew', 'Rice', 'Beans', 'Fish']),
+        )
+
+    def test_create_recipe_reuses_tag_ignoring_case(self):
+        """Test an existing tag is reused when the case differs"""
+        tag_lunch = Tag.objects.create(user=self.user, name='Lunch')
+        payload = {
+            'title': 'Waakye',
+            'time_in_minutes': 40,
+            'price': Decimal('15.00'),
+            'tags': [{'name': 'lunch'}, {'name': 'LUNCH'}]
+        }
+        res = self.client.post(RECIPE_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        recipe = Recipe.objects.get(id=res.data['id'])
+        self.assertEqual(list(recipe.tag.all()), [tag_lunch])
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 1)
 
     def test_create_tag_on_update(self):
         """Test create tag on update"""
@@ -301,12 +366,10 @@ class PrivateRecipeAPITest(TestCase):
         self.assertEqual(recipes.count(), 1)
         recipe = recipes[0]
         self.assertEqual(recipe.ingredients.count(), 2)
-        for ingredient in payload['ingredients']:
-            exists = recipe.ingredients.filter(
-                user=self.user,
-                name=ingredient['name']
-            ).exists()
-            self.assertTrue(exists)
+        names = set(recipe.ingredients.filter(
+            user=self.user).values_list('name', flat=True))
+        self.assertEqual(
+            names, {item['name'] for item in payload['ingredients']})
 
     def test_create_recipe_with_existing_ingredients(self):
         """Test to create a recipe with existing ingredients"""
@@ -334,12 +397,10 @@ class PrivateRecipeAPITest(TestCase):
         recipe = recipes[0]
         self.assertEqual(recipe.ingredients.count(), 2)
         self.assertIn(ingredient_new, recipe.ingredients.all())
-        for ingredient in payload['ingredients']:
-            exists = recipe.ingredients.filter(
-                name=ingredient['name'],
-                user=self.user
-            ).exists()
-            self.assertTrue(exists)
+        names = set(recipe.ingredients.filter(
+            user=self.user).values_list('name', flat=True))
+        self.assertEqual(
+            names, {item['name'] for item in payload['ingredients']})
 
     def test_create_ingredient_on_update(self):
         """Test to update an existing ingredient"""
@@ -387,30 +448,31 @@ class PrivateRecipeAPITest(TestCase):
 
     def test_filtering_recipe_with_tags(self):
         """Filter recipe with tags"""
-        r1 = create_recipe(user=self.user, title='Chicken Soup')
-        r2 = create_recipe(user=self.user, title='Goat light Soup')
-        r3 = create_recipe(user=self.user, title='Cow light Soup')
+        r1, r2, r3 = create_recipes(
+            self.user,
+            titles=['Chicken Soup', 'Goat light Soup', 'Cow light Soup'])
         tag1 = Tag.objects.create(user=self.user, name='Spicy')
         tag2 = Tag.objects.create(user=self.user, name='Best Soup')
         r1.tag.add(tag1)
         r2.tag.add(tag2)
 
         params = {'tags': f'{tag1.id}, {tag2.id}'}
-        res = self.client.get(RECIPE_URL, params)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPE_URL, params)
 
         s1 = RecipeSerializer(r1)
         s2 = RecipeSerializer(r2)
         s3 = RecipeSerializer(r3)
 
-        self.assertIn(s1.data, res.data)
-        self.assertIn(s2.data, res.data)
-        self.assertNotIn(s3.data, res.data)
+        self.assertIn(s1.data, res.data['results'])
+        self.assertIn(s2.data, res.data['results'])
+        self.assertNotIn(s3.data, res.data['results'])
 
     def test_filtering_recipe_with_ingredient(self):
         """Test for filtering recipe with an Ingredient"""
-        r1 = create_recipe(user=self.user, title='Chicken Soup')
-        r2 = create_recipe(user=self.user, title='Goat light Soup')
-        r3 = create_recipe(user=self.user, title='Cow light Soup')
+        r1, r2, r3 = create_recipes(
+            self.user,
+            titles=['Chicken Soup', 'Goat light Soup', 'Cow light Soup'])
         ingredient1 = Ingredients.objects.create(
             user=self.user, name='Chicken')
         ingredient2 = Ingredients.objects.create(user=self.user, name='Goat')
@@ -418,26 +480,60 @@ class PrivateRecipeAPITest(TestCase):
         r2.ingredients.add(ingredient2)
 
         params = {'ingredients': f'{ingredient1.id}, {ingredient2.id}'}
-        res = self.client.get(RECIPE_URL, params)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPE_URL, params)
 
         s1 = RecipeSerializer(r1)
         s2 = RecipeSerializer(r2)
         s3 = RecipeSerializer(r3)
 
-        self.assertIn(s1.data, res.data)
-        self.assertIn(s2.data, res.data)
-        self.assertNotIn(s3.data, res.data)
+        self.assertIn(s1.data, res.data['results'])
+        self.assertIn(s2.data, res.data['results'])
+        self.assertNotIn(s3.data, res.data['results'])
+
+    def test_filtering_recipe_ignores_trailing_comma(self):
+        """Test a trailing comma in the filter ids is ignored"""
+        r1, r2 = create_recipes(self.user)
+        tag = Tag.objects.create(user=self.user, name='Spicy')
+        r1.tag.add(tag)
+
+        res = self.client.get(RECIPE_URL, {'tags': f'{tag.id},'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['id'] for r in res.data['results']], [r1.id])
+
+    def test_filtering_recipe_with_empty_params(self):
+        """Test empty tags and ingredients filters return all recipes"""
+        r1, r2 = create_recipes(self.user)
+
+        res = self.client.get(RECIPE_URL, {'tags': '', 'ingredients': ''})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [r['id'] for r in res.data['results']], [r2.id, r1.id])
 
 
 class ImageUploadTest(TestCase):
     """Test for image upload API"""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpClass(cls):
+        media_root = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(media_root.cleanup)
+        media_override = override_settings(MEDIA_ROOT=media_root.name)
+        media_override.enable()
+        cls.addClassCleanup(media_override.disable)
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
             'user@example.com',
             'test123'
         )
+
+    def setUp(self):
+        self.client = APIClient()
         self.client.force_authenticate(self.user)
         self.recipe = create_recipe(user=self.user)
 
@@ -446,12 +542,12 @@ class ImageUploadTest(TestCase):
 
     def test_image_upload(self):
         url = image_upload_url(self.recipe.id)
-        with tempfile.NamedTemporaryFile(suffix='.jpg') as image_file:
-            img = Image.new('RGB', (10, 10))
-            img.save(image_file, 'JPEG')
-            image_file.seek(0)
-            payload = {'image': image_file}
-            res = self.client.post(url, payload, format='multipart')
+        image_file = io.BytesIO()
+        Image.new('RGB', (10, 10)).save(image_file, 'JPEG')
+        image_file.seek(0)
+        image_file.name = 'test.jpg'
+        payload = {'image': image_file}
+        res = self.client.post(url, payload, format='multipart')
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.recipe.refresh_from_db()
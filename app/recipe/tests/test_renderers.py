@@ -0,0 +1,91 @@
+"""
+Tests for the recipe API renderers
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from rest_framework.renderers import JSONRenderer
+
+from recipe.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    """Test rendering responses with orjson"""
+
+    def test_render_list_of_dicts(self):
+        """Test rendering nested recipe data"""
+        data = [{'id': 1, 'name': 'Soup', 'tags': [{'id': 2, 'name': 'Hot'}]}]
+
+        rendered = ORJSONRenderer().render(data)
+
+        self.assertEqual(
+            rendered,
+            b'[{"id":1,"name":"Soup","tags":[{"id":2,"name":"Hot"}]}]'
+        )
+
+    def test_render_falls_back_to_drf_encoder(self):
+        """Test types orjson does not know are encoded like DRF does"""
+        rendered = ORJSONRenderer().render({'price': Decimal('10.50')})
+
+        self.assertEqual(rendered, b'{"price":10.5}')
+
+    def test_render_none(self):
+        """Test rendering no data gives an empty body"""
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_render_indent_matches_json_renderer(self):
+        """Test indented output is left to the stock JSONRenderer"""
+        data = {'id': 1, 'tags': [{'id': 2, 'name': 'Hot'}]}
+        media_type = 'application/json; indent=4'
+
+        rendered = ORJSONRenderer().render(data, media_type)
+
+        self.assertEqual(rendered, JSONRenderer().render(data, media_type))
+        self.assertIn(b'\n    "id": 1', rendered)
+
+    def test_render_indent_from_context(self):
+        """Test the browsable API's indent is honoured"""
+        data = {'id': 1}
+        context = {'indent': 4}
+
+        rendered = ORJSONRenderer().render(data, None, context)
+
+        self.assertEqual(rendered, JSONRenderer().render(data, None, context))
+
+    def test_render_non_strict_matches_json_renderer(self):
+        """Test non-strict output is left to the stock JSONRenderer"""
+        renderer = ORJSONRenderer()
+        renderer.strict = False
+
+        rendered = renderer.render({'value': float('nan')})
+
+        self.assertEqual(rendered, b'{"value":NaN}')
+
+    def test_render_datetime_matches_json_renderer(self):
+        """Test aware datetimes are encoded like DRF does"""
+        data = {'created': datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)}
+
+        rendered = ORJSONRenderer().render(data)
+
+        self.assertEqual(rendered, b'{"created":"2024-01-02T03:04:05Z"}')
+        self.assertEqual(rendered, JSONRenderer().render(data))
+
+    def test_render_escapes_line_separators(self):
+        """Test U+2028 and U+2029 are escaped like DRF does"""
+        data = {'name': 'Soup\u2028Salad\u2029'}
+
+        rendered = ORJSONRenderer().render(data)
+
+        self.assertEqual(rendered, b'{"name":"Soup\\u2028Salad\\u2029"}')
+        self.assertEqual(rendered, JSONRenderer().render(data))
+
+    def test_render_big_int_matches_json_renderer(self):
+        """Test integers orjson cannot encode fall back to JSONRenderer"""
+        data = {'id': 2 ** 64}
+
+        rendered = ORJSONRenderer().render(data)
+
+        self.assertEqual(rendered, b'{"id":18446744073709551616}')
+        self.assertEqual(rendered, JSONRenderer().render(data))
@@ -0,0 +1,44 @@
+"""
+Tests for the recipe serializers
+"""
+from django.test import SimpleTestCase
+
+from recipe.serializers import DetailRecipeSerializer, RecipeSerializer
+
+
+class RecipeSerializerFieldCacheTest(SimpleTestCase):
+    """Test the per-class cache of recipe serializer fields"""
+
+    def setUp(self):
+        for serializer_class in (RecipeSerializer, DetailRecipeSerializer):
+            if '_cached_fields' in serializer_class.__dict__:
+                del serializer_class._cached_fields
+
+    def test_instances_get_own_fields(self):
+        """Test two serializers do not share field objects"""
+        fields1 = RecipeSerializer().fields
+        fields2 = RecipeSerializer().fields
+
+        self.assertEqual(list(fields1), list(fields2))
+        for name in fields1:
+            self.assertIsNot(fields1[name], fields2[name])
+
+    def test_detail_fields_after_list_cached(self):
+        """Test the detail serializer keeps its extra fields once the list
+        serializer has cached its own"""
+        RecipeSerializer().fields
+
+        fields = DetailRecipeSerializer().fields
+
+        self.assertIn('description', fields)
+        self.assertIn('image', fields)
+
+    def test_list_fields_after_detail_cached(self):
+        """Test the list serializer does not pick up the detail fields
+        once the detail serializer has cached them"""
+        DetailRecipeSerializer().fields
+
+        fields = RecipeSerializer().fields
+
+        self.assertNotIn('description', fields)
+        self.assertNotIn('image', fields)
@@ -1,11 +1,9 @@
 """
 Tests for Tags API
 """
-from decimal import Decimal
-
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -30,11 +28,21 @@ def create_tag(user, **params):
     tag = Tag.objects.create(user=user, **default)
     return tag
 
+
+def create_tags(user, names):
+    """Create and return new tags in one insert"""
+    return Tag.objects.bulk_create(
+        [
+            Tag(user=user, name=name, name_lower=name.lower())
+            for name in names
+        ]
+    )
+
 def detail_url(tag_id):
     """URL for a specific tag"""
     return reverse('recipe:tag-detail', args=[tag_id])
 
-class PublicTagsAPITest(TestCase):
+class PublicTagsAPITest(SimpleTestCase):
     """Test unauthenticated API requests"""
     def setUp(self):
         self.client = APIClient()
@@ -48,19 +56,22 @@ class PublicTagsAPITest(TestCase):
 
 class PrivateTagsAPITest(TestCase):
     """Test for authenticated API requests"""
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user()
+
     def setUp(self):
-        self.user = create_user()
         self.client = APIClient()
 
         self.client.force_authenticate(self.user)
 
     def test_retrieve_tags(self):
         """Test to retrieve a list of tags"""
-        create_tag(user=self.user, name="Vegan")
-        create_tag(user=self.user, name="Dessert")
+        create_tags(self.user, ["Vegan", "Dessert"])
 
-        res = self.client.get(TAG_URL)
-        tags = Tag.objects.all().order_by('-name')
+        with self.assertNumQueries(1):
+            res = self.client.get(TAG_URL)
+        tags = list(Tag.objects.all().order_by('-name'))
         serializer = TagSerializer(tags, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -92,6 +103,39 @@ class PrivateTagsAPITest(TestCase):
         tag.refresh_from_db()
         self.assertEqual(tag.name, payload['name'])
 
+    def test_update_tag_to_existing_name_error(self):
+        """Test renaming a tag to another tag's name is rejected"""
+        create_tag(user=self.user, name='Dinner')
+        tag = create_tag(user=self.user, name='Lunch')
+        url = detail_url(tag.id)
+        res = self.client.patch(url, {'name': 'Dinner'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        tag.refresh_from_db()
+        self.assertEqual(tag.name, 'Lunch')
+
+    def test_update_tag_to_existing_name_other_case_error(self):
+        """Test renaming a tag to another tag's name in other case fails"""
+        create_tag(user=self.user, name='Dinner')
+        tag = create_tag(user=self.user, name='Lunch')
+        url = detail_url(tag.id)
+        res = self.client.patch(url, {'name': 'dinner'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        tag.refresh_from_db()
+        self.assertEqual(tag.name, 'Lunch')
+
+    def test_update_tag_case_only(self):
+        """Test a tag can be renamed to a different case of itself"""
+        tag = create_tag(user=self.user, name='lunch')
+        url = detail_url(tag.id)
+        res = self.client.patch(url, {'name': 'Lunch'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        tag.refresh_from_db()
+        self.assertEqual(tag.name, 'Lunch')
+        self.assertEqual(tag.name_lower, 'lunch')
+
     def test_delete_tag(self):
         """Test for deleting a tag"""
         tag = create_tag(user=self.user)
@@ -105,12 +149,11 @@ class PrivateTagsAPITest(TestCase):
 
     def test_filtering_tags_assigned_to_recipes(self):
         """Test to list filtered tags"""
-        tag1 = create_tag(user=self.user, name='stew')
-        tag2 = create_tag(user=self.user, name='dinner')
+        tag1, tag2 = create_tags(self.user, ['stew', 'dinner'])
         recipe1 = Recipe.objects.create(
             title='Palava Sauce',
             time_in_minutes=34,
-            price=Decimal('40.00'),
+            price=4000,
             user=self.user
         )
         recipe1.tag.add(tag1)
@@ -125,18 +168,17 @@ class PrivateTagsAPITest(TestCase):
 
     def test_filtered_tags_are_unique(self):
         """Test the uniqueness of filtered tags"""
-        tag = create_tag(user=self.user, name='Veges')
-        create_tag(user=self.user, name='dinner')
+        tag, _ = create_tags(self.user, ['Veges', 'dinner'])
         recipe1 = Recipe.objects.create(
             title='Banku',
             time_in_minutes=45,
-            price=Decimal('34.00'),
+            price=3400,
             user=self.user,
         )
         recipe2 = Recipe.objects.create(
             title='Fufu',
             time_in_minutes=45,
-            price=Decimal('34.00'),
+            price=3400,
             user=self.user,
         )
 
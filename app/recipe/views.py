@@ -5,6 +5,8 @@ from drf_spectacular.utils import (
     OpenApiTypes
 )
 
+from django.db.models import Exists, OuterRef
+
 from rest_framework import (viewsets,
                             mixins, status)
 
@@ -14,6 +16,7 @@ from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
 from recipe import serializers
+from recipe.pagination import RecipeCursorPagination
 from core.models import (Recipe,
                          Tag,
                          Ingredients)
@@ -37,35 +40,54 @@ from symbol import parameters
 )
 class RecipeViewSet(viewsets.ModelViewSet):
     serializer_class = serializers.DetailRecipeSerializer
-    queryset = Recipe.objects.all()
+    queryset = Recipe.objects.none()
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
+    pagination_class = RecipeCursorPagination
+    list_fields = ['id', 'title', 'time_in_minutes', 'price', 'link']
+    serializer_classes = {
+        'list': serializers.RecipeSerializer,
+        'upload_image': serializers.RecipeImageSerializer,
+    }
 
     def _params_to_ints(self, qs):
         """Convert a list of strings to integers"""
-        return [int(str_id) for str_id in qs.split(',')]
+        return [int(str_id) for str_id in qs.split(',') if str_id.strip()]
 
     def get_queryset(self):
         """Retrieve recipe for authenticated users"""
-        tag = self.request.query_params.get('tags')
-        ingredients = self.request.query_params.get('ingredients')
-        queryset = self.queryset
-        if tag:
-            tag_ids = self._params_to_ints(tag)
+        tag_ids = self._params_to_ints(
+            self.request.query_params.get('tags', ''))
+        ingredient_ids = self._params_to_ints(
+            self.request.query_params.get('ingredients', ''))
+        queryset = Recipe.objects.all()
+        if tag_ids:
             queryset = queryset.filter(tag__id__in=tag_ids)
-        if ingredients:
-            ingredient_ids = self._params_to_ints(ingredients)
+        if ingredient_ids:
             queryset = queryset.filter(ingredients__id__in=ingredient_ids)
-        return queryset.filter(
+        queryset = queryset.filter(
             user=self.request.user
             ).order_by('-id').distinct()
+        if self.action in ('upload_image', 'destroy'):
+            return queryset.defer('description')
+        if self.action == 'list':
+            return queryset.values(*self.list_fields)
+        return queryset.prefetch_related('tag', 'ingredients')
 
     def get_serializer_class(self):
-        if self.action == 'list':
-            return serializers.RecipeSerializer
-        elif self.action == 'upload_image':
-            return serializers.RecipeImageSerializer
-        return self.serializer_class
+        return self.serializer_classes.get(self.action, self.serializer_class)
+
+    def list(self, request, *args, **kwargs):
+        """List recipes from a column projection instead of model
+        instances"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                serializers.RecipeSerializer.represent_rows(page))
+
+        rows = serializers.RecipeSerializer.represent_rows(list(queryset))
+        return Response(rows)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
@@ -106,22 +128,34 @@ class BaseRecipeAttrViewSet(mixins.ListModelMixin,
         assigned_only = bool(
             int(self.request.query_params.get('assigned_only', 0))
         )
-        queryset = self.queryset
+        queryset = self.queryset.model.objects.all()
         if assigned_only:
-            queryset = queryset.filter(recipe__isnull=False)
-        return queryset.filter(
+            queryset = queryset.filter(Exists(Recipe.objects.filter(
+                **{self.recipe_relation: OuterRef('pk')}
+            )))
+        queryset = queryset.filter(
             user=self.request.user
-            ).order_by('-name').distinct()
+            ).order_by('-name')
+        if self.action == 'list':
+            queryset = queryset.only('id', 'name')
+        return queryset
 
 
 class TagViewSet(BaseRecipeAttrViewSet):
     """Manage Tags in the database."""
     serializer_class = serializers.TagSerializer
-    queryset = Tag.objects.all()
+    queryset = Tag.objects.none()
+    recipe_relation = 'tag'
 
 
 class IngredientViewSet(BaseRecipeAttrViewSet):
     """Manage Ingredients in the database"""
     serializer_class = serializers.IngredientSerializer
-    queryset = Ingredients.objects.all()
+    queryset = Ingredients.objects.none()
+    recipe_relation = 'ingredients'
+
+    def list(self, request, *args, **kwargs):
+        """List ingredients straight from an id/name column projection"""
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(list(queryset.values('id', 'name')))
 